@@ -1,8 +1,12 @@
+import io
 import os
+import matplotlib
+matplotlib.use("Agg")  # Render straight to PNG, no GUI backend needed
 import matplotlib.pyplot as plt
 from docx import Document
 from docx.shared import Inches
 import numpy as np
+from PIL import Image
 
 # Folder to save graphs
 graph_dir = "graphs"
@@ -11,6 +15,9 @@ os.makedirs(graph_dir, exist_ok=True)
 # Word report path
 report_path = "Performance_Report.docx"
 
+plt.rcParams["path.simplify"] = True
+plt.rcParams["agg.path.chunksize"] = 10000
+
 
 # ==== Dummy Data for Graphs (replace with real metrics if available) ====
 def generate_dummy_data():
@@ -34,69 +41,121 @@ def generate_dummy_data():
 # ==== Plot & Save Functions ====
 def save_plot(fig, filename):
     filepath = os.path.join(graph_dir, filename)
-    fig.savefig(filepath, bbox_inches='tight')
-    plt.close(fig)
+    fig.savefig(filepath, bbox_inches='tight', dpi=100)
     return filepath
 
 
-def plot_graphs(data):
-    paths = []
+# One figure is reused for every chart and cleared in between
+_figure = None
+
+
+def _get_axes():
+    global _figure
+    if _figure is None:
+        _figure, _ = plt.subplots()
+    ax = _figure.axes[0]
+    ax.clear()
+    return _figure, ax
+
 
-    # 1. Accuracy vs. Handwriting Complexity
-    fig, ax = plt.subplots()
+# 1. Accuracy vs. Handwriting Complexity
+def _plot_accuracy_vs_complexity(data):
+    fig, ax = _get_axes()
     ax.bar(data["Handwriting Complexity"], data["Accuracy"], color="skyblue")
     ax.set_title("Accuracy vs. Handwriting Complexity")
     ax.set_ylabel("Accuracy (%)")
-    paths.append(save_plot(fig, "accuracy_vs_complexity.png"))
+    return save_plot(fig, "accuracy_vs_complexity.png")
 
-    # 2. WER vs. Text Length
-    fig, ax = plt.subplots()
+
+# 2. WER vs. Text Length
+def _plot_wer_vs_textlength(data):
+    fig, ax = _get_axes()
     ax.plot(data["Text Length"], data["WER"], marker='o', color="salmon")
     ax.set_title("Word Error Rate vs. Text Length")
     ax.set_xlabel("Text Length (words)")
     ax.set_ylabel("WER (%)")
-    paths.append(save_plot(fig, "wer_vs_textlength.png"))
+    return save_plot(fig, "wer_vs_textlength.png")
+
 
-    # 3. Processing Time vs. Image Resolution
-    fig, ax = plt.subplots()
+# 3. Processing Time vs. Image Resolution
+def _plot_time_vs_resolution(data):
+    fig, ax = _get_axes()
     ax.bar(data["Image Resolution"], data["Processing Time"], color="purple")
     ax.set_title("Processing Time vs. Image Resolution")
     ax.set_ylabel("Time (ms)")
-    paths.append(save_plot(fig, "time_vs_resolution.png"))
+    return save_plot(fig, "time_vs_resolution.png")
 
-    # 4. OCR Accuracy Before and After PSO
-    fig, ax = plt.subplots()
+
+# 4. OCR Accuracy Before and After PSO
+def _plot_accuracy_pso(data):
+    fig, ax = _get_axes()
     ax.bar(data["Configurations"], data["OCR Accuracy"], color=["gray", "green"])
     ax.set_title("OCR Accuracy (Before vs. After PSO)")
     ax.set_ylabel("Accuracy (%)")
-    paths.append(save_plot(fig, "accuracy_pso.png"))
+    return save_plot(fig, "accuracy_pso.png")
+
 
-    # 5. OCR Confidence Score Distribution
-    fig, ax = plt.subplots()
+# 5. OCR Confidence Score Distribution
+def _plot_confidence_distribution(data):
+    fig, ax = _get_axes()
     ax.hist(data["Confidence Scores"], bins=20, color="orange", edgecolor='black')
     ax.set_title("OCR Confidence Score Distribution")
     ax.set_xlabel("Confidence Score")
     ax.set_ylabel("Frequency")
-    paths.append(save_plot(fig, "confidence_distribution.png"))
+    return save_plot(fig, "confidence_distribution.png")
 
-    # 6. Latency vs. Handwriting Type
-    fig, ax = plt.subplots()
+
+# 6. Latency vs. Handwriting Type
+def _plot_latency_vs_style(data):
+    fig, ax = _get_axes()
     ax.bar(data["Handwriting Type"], data["Latency"], color="teal")
     ax.set_title("Digitization Latency vs. Handwriting Style")
     ax.set_ylabel("Latency (ms)")
-    paths.append(save_plot(fig, "latency_vs_style.png"))
+    return save_plot(fig, "latency_vs_style.png")
+
 
-    # 7. FPS vs. Page Size
-    fig, ax = plt.subplots()
+# 7. FPS vs. Page Size
+def _plot_fps_vs_pagesize(data):
+    fig, ax = _get_axes()
     ax.bar(data["Page Sizes"], data["FPS"], color="gold")
     ax.set_title("Frames Per Second vs. Document Page Size")
     ax.set_ylabel("FPS")
-    paths.append(save_plot(fig, "fps_vs_pagesize.png"))
+    return save_plot(fig, "fps_vs_pagesize.png")
+
+
+_PLOTS = [
+    _plot_accuracy_vs_complexity,
+    _plot_wer_vs_textlength,
+    _plot_time_vs_resolution,
+    _plot_accuracy_pso,
+    _plot_confidence_distribution,
+    _plot_latency_vs_style,
+    _plot_fps_vs_pagesize,
+]
 
+
+def plot_graphs(data):
+    global _figure
+    paths = [plot_fn(data) for plot_fn in _PLOTS]
+    plt.close(_figure)
+    _figure = None
     return paths
 
 
 # ==== Add Graphs to Word ====
+def downscale_png(path, max_width=750):
+    # python-docx embeds the raw file, so shrink wide images to what 5.5"
+    # needs; anything already narrow enough is passed through untouched
+    image = Image.open(path)
+    if image.width <= max_width:
+        return path
+    image.thumbnail((max_width, 10000), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", optimize=True)
+    buffer.seek(0)
+    return buffer
+
+
 def generate_word_report(graph_paths):
     doc = Document()
     doc.add_heading("Performance Evaluation Report", 0)
@@ -104,7 +163,7 @@ def generate_word_report(graph_paths):
     for path in graph_paths:
         title = os.path.splitext(os.path.basename(path))[0].replace("_", " ").title()
         doc.add_heading(title, level=2)
-        doc.add_picture(path, width=Inches(5.5))
+        doc.add_picture(downscale_png(path), width=Inches(5.5))
 
     doc.save(report_path)
     print(f"\n✅ Report saved as: {report_path}")
@@ -1,8 +1,33 @@
 import os
+import copy
+import atexit
+import queue
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+# Tesseract's OpenMP threading scales poorly; run it single-threaded
+# and parallelise across images instead
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
 import cv2
 import numpy as np
 import pytesseract
 from docx import Document
+from PIL import Image
+
+# tesserocr keeps the engine loaded in-process between calls; without it
+# every call goes through a fresh tesseract subprocess via pytesseract
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
+
+# Let OpenCV's transparent API use OpenCL where available
+cv2.ocl.setUseOpenCL(True)
 
 # Set path to Tesseract if you're on Windows
 pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
@@ -12,12 +37,32 @@ data_dir = "data"
 output_dir = "output"
 os.makedirs(output_dir, exist_ok=True)
 
+# Denoising used by the menu flows: "nlm" or "fast" (3x3 median)
+denoise_mode = "nlm"
+
 # Global text buffer
 extracted_text = ""
 current_image = ""
 
+# Parsed once; save_output copies it instead of re-reading the default template
+_docx_template = Document()
+
+# Lazily created Tesseract handle, reused for every OCR call in this process
+_tess_api = None
+_tess_api_failed = False
+
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg"})
+
+@lru_cache(maxsize=4)
+def _scan_images(folder, mtime):
+    # mtime is only part of the cache key: adding or removing a file
+    # changes the folder's mtime and forces a fresh scan
+    with os.scandir(folder) as entries:
+        return tuple(entry.name for entry in entries
+                     if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS)
+
 def list_images(folder):
-    images = [f for f in os.listdir(folder) if f.lower().endswith((".png", ".jpg", ".jpeg"))]
+    images = list(_scan_images(folder, os.path.getmtime(folder)))
     if not images:
         print(" No images found in the 'data/' folder.")
     else:
@@ -27,45 +72,127 @@ def list_images(folder):
     return images
 
 def deskew(image):
-    coords = np.column_stack(np.where(image > 0))
-    angle = cv2.minAreaRect(coords)[-1]
-    if angle < -45:
-        angle = -(90 + angle)
-    else:
-        angle = -angle
+    # Estimate skew from text-line segments instead of collecting every
+    # foreground pixel, which costs memory proportional to the page
     (h, w) = image.shape[:2]
+    edges = cv2.Canny(image, 50, 150)
+    lines = cv2.HoughLinesP(edges, 1, np.pi / 720, 100, minLineLength=w // 4, maxLineGap=20)
+    if lines is None:
+        return image
+
+    x1, y1, x2, y2 = lines.reshape(-1, 4).T
+    dx = x2 - x1
+    dy = y2 - y1
+    # Fold into [-90, 90) degrees so segment direction doesn't matter
+    angles = (np.arctan2(dy, dx) + np.pi / 2) % np.pi - np.pi / 2
+    angles = angles[np.abs(angles) < np.pi / 6]
+    if angles.size == 0:
+        return image
+
+    angle = np.degrees(np.median(angles))
+    # Scanner output is usually straight; skip resampling for tiny angles
+    if abs(angle) < 0.5:
+        return image
+
     center = (w // 2, h // 2)
     M = cv2.getRotationMatrix2D(center, angle, 1.0)
-    rotated = cv2.warpAffine(image, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+    rotated = cv2.warpAffine(image, M, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
     return rotated
 
-def preprocess_image(image_path):
-    image = cv2.imread(image_path)
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+def read_image_bytes(image_path):
+    return np.fromfile(image_path, dtype=np.uint8)
+
+def preprocess_image(image_path, denoise="nlm", max_side=2500):
+    return preprocess_image_bytes(read_image_bytes(image_path), denoise, max_side, source=image_path)
+
+def preprocess_image_bytes(data, denoise="nlm", max_side=2500, source="image data"):
+    gray = cv2.imdecode(data, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise ValueError(f"Could not decode image: {source}")
 
-    # Denoising
-    denoised = cv2.fastNlMeansDenoising(gray, None, 30, 7, 21)
+    # Cap resolution at roughly 300 DPI; Tesseract gains nothing from
+    # larger scans and its runtime grows with pixel count
+    (h, w) = gray.shape[:2]
+    scale = min(1.0, max_side / max(h, w))
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
 
-    # Adaptive Thresholding
-    thresh = cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+    # Keep intermediates in a UMat so the filters run through the T-API
+    # without a host round-trip between stages
+    image = cv2.UMat(gray)
+
+    # Denoising: "nlm" is non-local means, "fast" a much cheaper 3x3 median
+    if denoise == "nlm":
+        denoised = cv2.fastNlMeansDenoising(image, None, 30, 7, 21)
+    elif denoise == "fast":
+        denoised = cv2.medianBlur(image, 3)
+    else:
+        raise ValueError(f"Unknown denoise mode: {denoise}")
+
+    # Adaptive Thresholding (box mean, much cheaper than a 31x31 Gaussian)
+    thresh = cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
                                    cv2.THRESH_BINARY, 31, 10)
 
     # Deskewing
-    thresh = deskew(thresh)
+    thresh = deskew(thresh.get())
 
     return thresh
 
+def _get_tess_api():
+    # None means fall back to pytesseract: tesserocr is missing or can't
+    # initialise (e.g. no tessdata configured for it, common on Windows)
+    global _tess_api, _tess_api_failed
+    if _tess_api is None and not _tess_api_failed and PyTessBaseAPI is not None:
+        try:
+            _tess_api = PyTessBaseAPI(lang='eng')
+        except RuntimeError:
+            _tess_api_failed = True
+    return _tess_api
+
+def _close_tess_api():
+    global _tess_api
+    if _tess_api is not None:
+        _tess_api.End()
+        _tess_api = None
+
+atexit.register(_close_tess_api)
+
 def extract_text_from_image(image):
-    return pytesseract.image_to_string(image, lang='eng')
+    api = _get_tess_api()
+    if api is None:
+        return pytesseract.image_to_string(image, lang='eng')
+    api.SetImage(Image.fromarray(image))
+    return api.GetUTF8Text()
+
+def extract_text_from_images(images):
+    if _get_tess_api() is not None:
+        return [extract_text_from_image(image) for image in images]
+
+    # Run Tesseract once over a list file instead of once per image,
+    # so engine start-up and model loading are paid a single time.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        image_paths = []
+        for i, image in enumerate(images):
+            image_path = os.path.join(tmp_dir, f"{i}.png")
+            cv2.imwrite(image_path, image)
+            image_paths.append(image_path)
+
+        list_path = os.path.join(tmp_dir, "list.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(image_paths) + "\n")
+
+        text = pytesseract.image_to_string(list_path, lang='eng')
+
+    # Tesseract ends every page with a form feed
+    return text.split("\f")[:len(images)]
 
 def save_output(text, filename_base):
     txt_path = os.path.join(output_dir, f"{filename_base}.txt")
     docx_path = os.path.join(output_dir, f"{filename_base}.docx")
 
-    with open(txt_path, "w", encoding="utf-8") as f:
-        f.write(text)
+    Path(txt_path).write_text(text, encoding="utf-8")
 
-    doc = Document()
+    doc = copy.deepcopy(_docx_template)
     doc.add_paragraph(text)
     doc.save(docx_path)
 
@@ -77,30 +204,102 @@ def process_single_image(images):
         idx = int(input("\nEnter image number to process: ")) - 1
         if idx < 0 or idx >= len(images):
             raise ValueError
-        current_image = images[idx]
-        image_path = os.path.join(data_dir, current_image)
-
-        print(f"\n Processing: {current_image}")
-        preprocessed = preprocess_image(image_path)
-        extracted_text = extract_text_from_image(preprocessed)
-
-        print("\n Extraction complete.")
     except ValueError:
         print(" Invalid selection.")
+        return
+
+    current_image = images[idx]
+    image_path = os.path.join(data_dir, current_image)
+
+    print(f"\n Processing: {current_image}")
+    try:
+        preprocessed = preprocess_image(image_path, denoise_mode)
+    except ValueError as e:
+        print(f" {e}")
+        return
+    extracted_text = extract_text_from_image(preprocessed)
+
+    print("\n Extraction complete.")
+
+def _read_ahead(image_paths, buffer, stop):
+    for path in image_paths:
+        try:
+            item = read_image_bytes(path)
+        except Exception as e:
+            item = e
+        # Time out periodically so the thread exits once the consumer
+        # has given up on the batch instead of blocking on a full queue
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        if stop.is_set() or isinstance(item, Exception):
+            return
+
+def _process_chunk(image_paths, denoise):
+    # Some pytesseract errors (e.g. TesseractNotFoundError) can't be
+    # unpickled, which would surface from a pool as BrokenProcessPool;
+    # re-raise as a plain RuntimeError so the real message gets through
+    try:
+        # Read file bytes on a background thread so disk I/O overlaps with
+        # decoding and preprocessing of the previous image
+        buffer = queue.Queue(maxsize=4)
+        stop = threading.Event()
+        reader = threading.Thread(target=_read_ahead, args=(image_paths, buffer, stop), daemon=True)
+        reader.start()
+
+        try:
+            preprocessed = []
+            for path in image_paths:
+                data = buffer.get()
+                if isinstance(data, Exception):
+                    raise data
+                # flush so output from pool workers appears as it happens
+                print(f"\n Processing: {os.path.basename(path)}", flush=True)
+                preprocessed.append(preprocess_image_bytes(data, denoise, source=path))
+        finally:
+            stop.set()
+            reader.join()
+        print(f"\n Running OCR on {len(preprocessed)} image(s)...", flush=True)
+        return extract_text_from_images(preprocessed)
+    except Exception as e:
+        raise RuntimeError(str(e)) from e
+    finally:
+        # Pool workers exit via os._exit, skipping atexit, so close here
+        if multiprocessing.parent_process() is not None:
+            _close_tess_api()
 
 def process_multiple_images(images):
     global extracted_text
     selected_indices = input("\nEnter image numbers to process (comma-separated): ")
     try:
         indices = [int(i.strip()) - 1 for i in selected_indices.split(',') if i.strip().isdigit()]
+        selected = [images[idx] for idx in indices if 0 <= idx < len(images)]
+        image_paths = [os.path.join(data_dir, name) for name in selected]
+
+        # One worker per four cores, each running a single Tesseract
+        # batch over a contiguous slice so results stay in order
+        texts = []
+        if image_paths:
+            workers = max(1, min(len(image_paths), (os.cpu_count() or 1) // 4))
+            if workers == 1:
+                # A lone worker would only add interpreter start-up cost
+                texts = _process_chunk(image_paths, denoise_mode)
+            else:
+                size = -(-len(image_paths) // workers)
+                chunks = [image_paths[i:i + size] for i in range(0, len(image_paths), size)]
+                # Spawn rather than fork so workers don't inherit an OpenCL context
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                    # Pass the mode explicitly; spawned workers re-import this module
+                    modes = [denoise_mode] * len(chunks)
+                    for chunk_texts in executor.map(_process_chunk, chunks, modes):
+                        texts.extend(chunk_texts)
         combined_text = ""
-        for idx in indices:
-            if 0 <= idx < len(images):
-                print(f"\n Processing: {images[idx]}")
-                image_path = os.path.join(data_dir, images[idx])
-                preprocessed = preprocess_image(image_path)
-                text = extract_text_from_image(preprocessed)
-                combined_text += f"\n--- {images[idx]} ---\n{text}\n"
+        for name, text in zip(selected, texts):
+            combined_text += f"\n--- {name} ---\n{text}\n"
         extracted_text = combined_text
         print("\n Multiple image extraction complete.")
     except Exception as e:
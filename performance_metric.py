@@ -1,71 +1,71 @@
+from collections import Counter
+
 import numpy as np
 import pandas as pd
-from openpyxl import Workbook
+from rapidfuzz.distance import Levenshtein
 
 # 1. Tabular Representation of Performance Parameters (Formulas)
-def get_performance_formulas():
-    formulas_data = {
-        "Metric": [
-            "Character Recognition Accuracy",
-            "Word Error Rate (WER)",
-            "Character Error Rate (CER)",
-            "Precision",
-            "Recall (Sensitivity)",
-            "F1-Score",
-            "Processing Time per Page (Tp)",
-            "Frames Per Second (FPS)",
-            "Computational Efficiency Gain (%)",
-            "Handwriting Complexity Score (HCS)",
-            "Digitization Latency (L)"
-        ],
-        "Formula": [
-            "Accuracy = (Correctly Recognized Characters / Total Characters) * 100",
-            "WER = (S + D + I) / N  where S = Substitutions, D = Deletions, I = Insertions, N = Total Words",
-            "CER = (S + D + I) / N  where S = Substitutions, D = Deletions, I = Insertions, N = Total Characters",
-            "Precision = TP / (TP + FP)",
-            "Recall = TP / (TP + FN)",
-            "F1-Score = 2 * (Precision * Recall) / (Precision + Recall)",
-            "Tp = Total Pages Processed / Total Processing Time",
-            "FPS = Tp / 1",
-            "CE = (Time Without PSO - Time With PSO) / Time Without PSO * 100",
-            "HCS = (Sum of Handwriting Phases) / N",
-            "L = Tp + Tpost"
-        ],
-        "Description": [
-            "Measures the OCR’s correctness in extracting characters.",
-            "Measures errors in digitized text: S = Substitutions, D = Deletions, I = Insertions, N = Total Words.",
-            "Similar to WER but computed at the character level.",
-            "Measures how many recognized words were correctly identified.",
-            "Measures the ability to recognize actual words correctly.",
-            "Balances precision and recall for OCR effectiveness.",
-            "Measures the speed of handwritten note digitization.",
-            "Determines real-time OCR processing capability.",
-            "Measures performance improvement using PSO.",
-            "Evaluates OCR performance on different handwriting styles.",
-            "Measures the total time taken from input image processing to text output."
-        ]
-    }
+# The table is static, so it is built once at import and reused
+_FORMULAS_DF = pd.DataFrame({
+    "Metric": [
+        "Character Recognition Accuracy",
+        "Word Error Rate (WER)",
+        "Character Error Rate (CER)",
+        "Precision",
+        "Recall (Sensitivity)",
+        "F1-Score",
+        "Processing Time per Page (Tp)",
+        "Frames Per Second (FPS)",
+        "Computational Efficiency Gain (%)",
+        "Handwriting Complexity Score (HCS)",
+        "Digitization Latency (L)"
+    ],
+    "Formula": [
+        "Accuracy = (Correctly Recognized Characters / Total Characters) * 100",
+        "WER = (S + D + I) / N  where S = Substitutions, D = Deletions, I = Insertions, N = Total Words",
+        "CER = (S + D + I) / N  where S = Substitutions, D = Deletions, I = Insertions, N = Total Characters",
+        "Precision = TP / (TP + FP)",
+        "Recall = TP / (TP + FN)",
+        "F1-Score = 2 * (Precision * Recall) / (Precision + Recall)",
+        "Tp = Total Pages Processed / Total Processing Time",
+        "FPS = Tp / 1",
+        "CE = (Time Without PSO - Time With PSO) / Time Without PSO * 100",
+        "HCS = (Sum of Handwriting Phases) / N",
+        "L = Tp + Tpost"
+    ],
+    "Description": [
+        "Measures the OCR’s correctness in extracting characters.",
+        "Measures errors in digitized text: S = Substitutions, D = Deletions, I = Insertions, N = Total Words.",
+        "Similar to WER but computed at the character level.",
+        "Measures how many recognized words were correctly identified.",
+        "Measures the ability to recognize actual words correctly.",
+        "Balances precision and recall for OCR effectiveness.",
+        "Measures the speed of handwritten note digitization.",
+        "Determines real-time OCR processing capability.",
+        "Measures performance improvement using PSO.",
+        "Evaluates OCR performance on different handwriting styles.",
+        "Measures the total time taken from input image processing to text output."
+    ]
+})
 
-    return pd.DataFrame(formulas_data)
+def get_performance_formulas():
+    return _FORMULAS_DF
 
 # 2. Calculate Metrics
 def calculate_metrics(true_text, predicted_text):
     true_words = true_text.split()
     predicted_words = predicted_text.split()
 
-    # Word Error Rate (WER)
-    substitutions = sum([w1 != w2 for w1, w2 in zip(true_words, predicted_words)])
-    deletions = len(true_words) - len(predicted_words)
-    insertions = len(predicted_words) - len(true_words)
-    wer = (substitutions + deletions + insertions) / len(true_words) if len(true_words) > 0 else 0
+    # Word Error Rate (WER): word-level edit distance covers S + D + I
+    wer = Levenshtein.distance(true_words, predicted_words) / len(true_words) if len(true_words) > 0 else 0
 
     # Character Error Rate (CER)
-    true_chars = list(''.join(true_words))
-    predicted_chars = list(''.join(predicted_words))
-    cer = sum([c1 != c2 for c1, c2 in zip(true_chars, predicted_chars)]) / len(true_chars) if len(true_chars) > 0 else 0
+    true_chars = ''.join(true_words)
+    predicted_chars = ''.join(predicted_words)
+    cer = Levenshtein.distance(true_chars, predicted_chars) / len(true_chars) if len(true_chars) > 0 else 0
 
-    # Precision, Recall, F1-Score
-    true_positives = sum([w1 == w2 for w1, w2 in zip(true_words, predicted_words)])
+    # Precision, Recall, F1-Score (bag-of-words overlap, order independent)
+    true_positives = sum((Counter(true_words) & Counter(predicted_words)).values())
     false_positives = len(predicted_words) - true_positives
     false_negatives = len(true_words) - true_positives
     precision = true_positives / (true_positives + false_positives) if true_positives + false_positives > 0 else 0
@@ -94,23 +94,24 @@ def save_metrics_to_excel(wer, cer, precision, recall, f1_score):
         ]
     }
 
-    # Create DataFrame for performance formulas and results
-    formulas_df = get_performance_formulas()
+    # Create DataFrame for the results; the formulas table is prebuilt
     results_df = pd.DataFrame(metrics_data)
 
     # Create a Workbook and write both DataFrames to separate sheets
-    with pd.ExcelWriter("performance_metrics_results.xlsx", engine='openpyxl') as writer:
-        formulas_df.to_excel(writer, sheet_name="Formulas", index=False)
+    with pd.ExcelWriter("performance_metrics_results.xlsx", engine='xlsxwriter') as writer:
+        _FORMULAS_DF.to_excel(writer, sheet_name="Formulas", index=False)
         results_df.to_excel(writer, sheet_name="Results", index=False)
 
     print("\nMetrics and formulas have been saved to 'performance_metrics_results.xlsx'.")
 
 # 4. Fitness Function for Optimization
 def calculate_fitness(accuracy, wer, cer, hcs, latency):
+    # Accepts scalars or per-particle arrays; evaluates a whole swarm at once
     w1, w2, w3, w4, w5 = 1, 1, 1, 1, 1
     max_latency = 1000
-    latency_normalized = latency / max_latency
-    fitness = (w1 * accuracy) + (w2 * (1 - wer)) + (w3 * (1 - latency_normalized)) + (w4 * hcs) + (w5 * (1 - cer))
+    latency_normalized = np.asarray(latency) / max_latency
+    fitness = ((w1 * np.asarray(accuracy)) + (w2 * (1 - np.asarray(wer))) + (w3 * (1 - latency_normalized))
+               + (w4 * np.asarray(hcs)) + (w5 * (1 - np.asarray(cer))))
     return fitness
 
 # CLI Menu